@@ -1,3 +1,4 @@
+import zlib
 from datetime import datetime
 
 import numpy as np
@@ -5,63 +6,80 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import streamlit as st
+from plotly.subplots import make_subplots
 
 # --- 1. Data Simulation (Identical to the Dash version - Replace with your actual data) ---
 
 
-# Simulate position data
+# Ticker labels are pre-built once and sliced per portfolio (n_positions < _MAX_POS)
+_MAX_POS = 30
+_TICKER_POOL = np.array([f"TICKER_{i}" for i in range(_MAX_POS)], dtype=object)
+
+
+# Simulate position data (cached via load_portfolio; do not mutate the result)
 def generate_dummy_positions(portfolio_name="Portfolio A"):
     # Simple mapping for deterministic generation based on portfolio name
-    seed = sum(ord(c) for c in portfolio_name)
-    np.random.seed(seed)
-    n_positions = np.random.randint(10, 30)
-    tickers = [f"TICKER_{i}" for i in range(n_positions)]
-    asset_classes = np.random.choice(
-        ["Equity", "Fixed Income", "FX", "Commodity"],
-        n_positions,
-        p=[0.5, 0.2, 0.15, 0.15],
+    seed = zlib.crc32(portfolio_name.encode())
+    rng = np.random.default_rng(seed)  # Local PCG64 generator, no global state
+    n_positions = rng.integers(10, _MAX_POS)
+    tickers = _TICKER_POOL[:n_positions]
+    # Categorical codes keep groupby and color mapping off string hashing
+    asset_classes = pd.Categorical(
+        rng.choice(
+            ["Equity", "Fixed Income", "FX", "Commodity"],
+            n_positions,
+            p=[0.5, 0.2, 0.15, 0.15],
+        ),
+        categories=["Equity", "Fixed Income", "FX", "Commodity"],
     )
-    market_values_usd = np.random.uniform(50000, 5000000, n_positions)
+    market_values_usd = rng.uniform(50000, 5000000, n_positions)
     # Simulate some factor sensitivities (simplified)
-    beta_spx = np.random.normal(1, 0.5, n_positions) * (
-        asset_classes == "Equity"
-    ) + np.random.normal(0.1, 0.1, n_positions) * (asset_classes != "Equity")
-    duration = np.random.normal(5, 2, n_positions) * (asset_classes == "Fixed Income")
-    delta_oil = np.random.normal(0.05, 0.2, n_positions) * (
-        asset_classes == "Commodity"
+    is_equity = asset_classes == "Equity"
+    beta_spx = np.where(
+        is_equity,
+        rng.normal(1, 0.5, n_positions),
+        rng.normal(0.1, 0.1, n_positions),
+    )
+    duration = np.where(
+        asset_classes == "Fixed Income", rng.normal(5, 2, n_positions), 0.0
+    )
+    delta_oil = np.where(
+        asset_classes == "Commodity", rng.normal(0.05, 0.2, n_positions), 0.0
     )
 
     return pd.DataFrame(
         {
             "Ticker": tickers,
             "AssetClass": asset_classes,
-            "MarketValueUSD": market_values_usd.round(2),
-            "Beta_SPX": beta_spx.round(3),
-            "Duration": duration.clip(0).round(3),  # Duration cannot be negative
-            "Delta_Oil": delta_oil.round(3),
+            # Values stay unrounded; display rounding belongs in the Styler.
+            # Dollar amounts stay float64 (float32 cannot resolve cents at $5M)
+            "MarketValueUSD": market_values_usd,
+            # float32 is ample for sensitivities and halves their footprint
+            "Beta_SPX": beta_spx.astype(np.float32),
+            # Duration cannot be negative
+            "Duration": duration.clip(0).astype(np.float32),
+            "Delta_Oil": delta_oil.astype(np.float32),
         }
     )
 
 
-# Simulate historical risk metrics
-# Use Streamlit's caching for better performance when portfolio doesn't change
-@st.cache_data  # Caches the output based on input arguments
+# Simulate historical risk metrics (cached via load_portfolio)
 def generate_dummy_risk_history(portfolio_name="Portfolio A"):
     # Adding print to show when function re-runs (cache misses)
     print(f"Cache miss: Generating risk history for {portfolio_name}")
-    seed = sum(ord(c) for c in portfolio_name) + 1
-    np.random.seed(seed)
+    seed = zlib.crc32(portfolio_name.encode()) + 1
+    rng = np.random.default_rng(seed)
     dates = pd.date_range(
         end=datetime.today(), periods=252 * 2
     ).normalize()  # ~2 years daily
     nav_start = 100_000_000
-    daily_returns = np.random.normal(0.0005, 0.01, len(dates))
-    nav = nav_start * (1 + daily_returns).cumprod()
-    var_99 = np.random.uniform(0.01, 0.03, len(dates)) * nav  # % VaR to absolute
-    es_99 = var_99 * np.random.uniform(1.2, 1.5, len(dates))  # ES > VaR
+    daily_returns = rng.normal(0.0005, 0.01, len(dates))
+    nav = nav_start * np.cumprod(1 + daily_returns)
+    var_99 = rng.uniform(0.01, 0.03, len(dates)) * nav  # % VaR to absolute
+    es_99 = var_99 * rng.uniform(1.2, 1.5, len(dates))  # ES > VaR
 
     # Calculate drawdowns
-    rolling_max = pd.Series(nav).cummax()
+    rolling_max = np.maximum.accumulate(nav)
     drawdown = (nav - rolling_max) / rolling_max
 
     return pd.DataFrame(
@@ -75,41 +93,198 @@ def generate_dummy_risk_history(portfolio_name="Portfolio A"):
     )
 
 
+# Chart downsampling (Largest-Triangle-Three-Buckets)
+HIST_CHART_POINTS = 200  # Max points per historical line trace
+
+
+def lttb_indices(x, y, n_out):
+    # Pick n_out indices that preserve the visual shape of the (x, y) series
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    every = (n - 2) / (n_out - 2)
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        # Triangle area between the last kept point, candidates and next bucket mean
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(area.argmax())
+        idx[i + 1] = a
+    return idx
+
+
+def downsample_series(df, x_col, y_col, n_out=HIST_CHART_POINTS):
+    # Return downsampled (x, y) arrays for a time-series line trace
+    x = df[x_col].to_numpy()
+    y = df[y_col].to_numpy()
+    idx = lttb_indices(x.astype("int64"), y, n_out)
+    return x[idx], y[idx]
+
+
+# Process-wide store of loaded portfolios (cache_resource: returned by reference,
+# no per-hit hashing/unpickling). Entries are shared, so treat them as read-only.
+# Control freshness of loaded data here (e.g. @st.cache_resource(ttl=...)), not on
+# the generate_* loaders. compute_scenario hashes the positions into its key, so
+# scenario results follow a refresh without a separate ttl.
+@st.cache_resource
+def _portfolio_cache():
+    return {}
+
+
+# Bundle positions, history and its downsampled chart traces so one lookup
+# hydrates all of them per portfolio (LTTB runs once per load, not per rerun)
+def load_portfolio(portfolio_name="Portfolio A"):
+    cache = _portfolio_cache()
+    bundle = cache.get(portfolio_name)
+    if bundle is None:
+        df_hist = generate_dummy_risk_history(portfolio_name)
+        hist_traces = {
+            col: downsample_series(df_hist, "Date", col)
+            for col in ("VaR_99_USD", "ES_99_USD", "Drawdown_Pct")
+        }
+        bundle = (generate_dummy_positions(portfolio_name), df_hist, hist_traces)
+        cache[portfolio_name] = bundle
+    return bundle
+
+
 # --- 2. Simplified Risk Engine Simulation (Identical to Dash version - Replace) ---
 def simulate_scenario_pnl(
     positions_df, spx_shock=0.0, rates_shock_bps=0.0, oil_shock=0.0
 ):
+    # Baseline (all-zero shocks): P&L is identically zero, skip the arithmetic
+    if spx_shock == 0.0 and rates_shock_bps == 0.0 and oil_shock == 0.0:
+        df = positions_df.copy()
+        df["ScenarioPnL"] = np.zeros(len(df))
+        return df
+
+    # Compute on raw ndarrays, then attach to a copy so cached data is never mutated
+    mv = positions_df["MarketValueUSD"].to_numpy()
+    beta = positions_df["Beta_SPX"].to_numpy()
+    delta_oil = positions_df["Delta_Oil"].to_numpy()
+    duration = positions_df["Duration"].to_numpy()
     rates_shock_decimal = rates_shock_bps / 10000.0
-    positions_df["ScenarioPnL"] = positions_df["MarketValueUSD"] * (
-        positions_df["Beta_SPX"] * spx_shock
-        + positions_df["Delta_Oil"] * oil_shock
-        - positions_df["Duration"] * rates_shock_decimal
+    pnl = mv * (
+        beta * spx_shock + delta_oil * oil_shock - duration * rates_shock_decimal
+    )
+    df = positions_df.copy()
+    df["ScenarioPnL"] = pnl
+    return df
+
+
+# --- 2b. Scenario Results (cached figures and summary) ---
+# Keyed on the positions themselves, so refreshed portfolio data is never stale
+@st.cache_data  # Caches figures/summary per (portfolio, shocks, positions) combination
+def compute_scenario(
+    portfolio_name: str,
+    spx_shock: float,
+    rates_shock_bps: float,
+    oil_shock: float,
+    positions_df: pd.DataFrame,  # Small frame; hashed into the cache key
+) -> dict:
+    df_results = simulate_scenario_pnl(
+        positions_df,
+        spx_shock=spx_shock,
+        rates_shock_bps=rates_shock_bps,
+        oil_shock=oil_shock,
+    )
+
+    # --- Create P&L Histogram ---
+    total_pnl = df_results["ScenarioPnL"].sum()
+    # Bin with NumPy and draw bars directly (skips Plotly Express overhead)
+    counts, edges = np.histogram(df_results["ScenarioPnL"].to_numpy(), bins=30)
+    centers = 0.5 * (edges[:-1] + edges[1:])
+    fig_hist = go.Figure(
+        go.Bar(x=centers, y=counts, width=np.diff(edges), name="ScenarioPnL")
+    )
+    fig_hist.update_layout(
+        title="P&L Distribution",
+        xaxis_title="Position P&L (USD)",
+        yaxis_title="Number of Positions",
+        bargap=0,
+        margin=dict(l=10, r=10, t=50, b=10),
+        height=400,  # Add title margin
+        title_font_size=16,
+        title_x=0.5,  # Center title
     )
-    return positions_df
 
+    # --- Create Impact Scatter Plot ---
+    fig_scatter = px.scatter(
+        df_results,
+        x="MarketValueUSD",
+        y="ScenarioPnL",
+        color="AssetClass",
+        hover_name="Ticker",
+        size="MarketValueUSD",
+        size_max=15,
+        title=f"Impact: P&L vs Market Value",
+        labels={
+            "MarketValueUSD": "Market Value (USD)",
+            "ScenarioPnL": "Scenario P&L (USD)",
+        },
+    )
+    fig_scatter.update_layout(
+        xaxis_title="Market Value (USD)",
+        yaxis_title="Scenario P&L (USD)",
+        margin=dict(l=10, r=10, t=50, b=10),
+        height=400,  # Add title margin
+        title_font_size=16,
+        title_x=0.5,  # Center title
+    )
+    fig_scatter.add_hline(y=0, line_dash="dash", line_color="grey")
+
+    # --- Create Summary Table ---
+    summary = (
+        df_results.groupby("AssetClass", observed=True)["ScenarioPnL"]
+        .agg(["sum", "mean", "count"])
+        .reset_index()
+    )
+    summary.rename(
+        columns={"sum": "Total PnL", "mean": "Avg PnL", "count": "N Positions"},
+        inplace=True,
+    )
+
+    # Append the total row from scalar totals (AssetClass loses its categorical dtype)
+    total_pnl_sum = summary["Total PnL"].sum()
+    total_n = summary["N Positions"].sum()
+    # Bold Total; no average of averages
+    summary.loc[len(summary)] = ["**TOTAL**", total_pnl_sum, np.nan, total_n]
+    summary_df = summary
 
-# --- 3. Predefined Scenarios (Identical dictionary) ---
+    return {
+        "fig_hist": fig_hist,
+        "fig_scatter": fig_scatter,
+        "summary_df": summary_df,
+        "total_pnl": total_pnl,
+    }
+
+
+# --- 3. Predefined Scenarios ---
+# Shocks are (spx_shock, rates_shock_bps, oil_shock) tuples: hashable for caching
 PREDEFINED_SCENARIOS = {
-    "None (Baseline)": {"spx_shock": 0.0, "rates_shock_bps": 0.0, "oil_shock": 0.0},
-    "Market Crash (-15% SPX)": {
-        "spx_shock": -0.15,
-        "rates_shock_bps": 0.0,
-        "oil_shock": 0.0,
-    },
-    "Rates Shock (+50bps)": {
-        "spx_shock": 0.0,
-        "rates_shock_bps": 50.0,
-        "oil_shock": 0.0,
-    },
-    "Oil Spike (+20%)": {"spx_shock": 0.0, "rates_shock_bps": 0.0, "oil_shock": 0.20},
-    "Recession Combo (-10% SPX, -75bps Rates)": {
-        "spx_shock": -0.10,
-        "rates_shock_bps": -75.0,
-        "oil_shock": -0.10,
-    },
+    "None (Baseline)": (0.0, 0.0, 0.0),
+    "Market Crash (-15% SPX)": (-0.15, 0.0, 0.0),
+    "Rates Shock (+50bps)": (0.0, 50.0, 0.0),
+    "Oil Spike (+20%)": (0.0, 0.0, 0.20),
+    "Recession Combo (-10% SPX, -75bps Rates)": (-0.10, -75.0, -0.10),
     "Custom": None,  # Placeholder for custom inputs
 }
 
+# Lookup of fixed scenario shocks, built once at import time
+SHOCK_BY_NAME = {
+    name: shocks for name, shocks in PREDEFINED_SCENARIOS.items() if shocks is not None
+}
+
 # --- 4. Streamlit App Layout and Logic ---
 
 # Set page config for wide layout
@@ -157,82 +332,73 @@ if scenario_name == "Custom":
 # Run Button - Use session state to store results
 run_button = st.sidebar.button("Run Scenario Analysis", key="run_button")
 
-# Initialize session state for scenario results if it doesn't exist
-if "scenario_results" not in st.session_state:
-    st.session_state.scenario_results = None
-if "last_run_portfolio" not in st.session_state:
-    st.session_state.last_run_portfolio = None
-if "last_run_scenario_name" not in st.session_state:
-    st.session_state.last_run_scenario_name = None
-if "last_custom_shocks" not in st.session_state:
-    st.session_state.last_custom_shocks = (
-        0.0,
-        0.0,
-        0.0,
-    )  # Tuple for immutability checks
+# Initialize session state for the last scenario run if it doesn't exist
+if "last_run" not in st.session_state:
+    st.session_state["last_run"] = None
 
 # --- Main Panel Display ---
 
 # --- Historical Risk Section ---
 st.header(f"Historical Risk Metrics: {selected_portfolio}")
 
-# Fetch historical data using the cached function
-df_hist = generate_dummy_risk_history(selected_portfolio)
-
-col1, col2 = st.columns(2)  # Create two columns for side-by-side charts
-
-with col1:
-    st.subheader("VaR & Expected Shortfall")
-    fig_var_es = go.Figure()
-    fig_var_es.add_trace(
-        go.Scatter(
-            x=df_hist["Date"],
-            y=df_hist["VaR_99_USD"],
-            mode="lines",
-            name="VaR 99% (USD)",
-            line=dict(color="orange"),
-        )
-    )
-    fig_var_es.add_trace(
-        go.Scatter(
-            x=df_hist["Date"],
-            y=df_hist["ES_99_USD"],
-            mode="lines",
-            name="ES 99% (USD)",
-            line=dict(color="red"),
-        )
-    )
-    fig_var_es.update_layout(
-        xaxis_title="Date",
-        yaxis_title="Amount (USD)",
-        legend=dict(yanchor="top", y=0.99, xanchor="left", x=0.01),
-        margin=dict(l=10, r=10, t=30, b=10),
-        height=350,
-    )  # Adjusted margin and height
-    st.plotly_chart(fig_var_es, use_container_width=True)  # Use container width
-
-with col2:
-    st.subheader("Drawdown")
-    fig_drawdown = go.Figure()
-    fig_drawdown.add_trace(
-        go.Scatter(
-            x=df_hist["Date"],
-            y=df_hist["Drawdown_Pct"],
-            mode="lines",
-            name="Drawdown",
-            fill="tozeroy",
-            line=dict(color="firebrick"),
-        )
-    )
-    fig_drawdown.update_layout(
-        xaxis_title="Date",
-        yaxis_title="Drawdown (%)",
-        yaxis_tickformat=".1%",
+# Fetch positions, history and pre-downsampled chart traces from the cached bundle
+# (each trace ships at most HIST_CHART_POINTS points)
+df_positions, df_hist, hist_traces = load_portfolio(selected_portfolio)
+var_x, var_y = hist_traces["VaR_99_USD"]
+es_x, es_y = hist_traces["ES_99_USD"]
+dd_x, dd_y = hist_traces["Drawdown_Pct"]
+
+# One figure with side-by-side panels (single Plotly.js instance, linked dates)
+fig_hist_risk = make_subplots(
+    rows=1,
+    cols=2,
+    shared_xaxes="all",
+    subplot_titles=("VaR & Expected Shortfall", "Drawdown"),
+)
+fig_hist_risk.add_trace(
+    go.Scattergl(
+        x=var_x,
+        y=var_y,
+        mode="lines",
+        name="VaR 99% (USD)",
+        line=dict(color="orange"),
+    ),
+    row=1,
+    col=1,
+)
+fig_hist_risk.add_trace(
+    go.Scattergl(
+        x=es_x,
+        y=es_y,
+        mode="lines",
+        name="ES 99% (USD)",
+        line=dict(color="red"),
+    ),
+    row=1,
+    col=1,
+)
+fig_hist_risk.add_trace(
+    go.Scattergl(
+        x=dd_x,
+        y=dd_y,
+        mode="lines",
+        name="Drawdown",
+        fill="tozeroy",
+        line=dict(color="firebrick"),
         showlegend=False,
-        margin=dict(l=10, r=10, t=30, b=10),
-        height=350,
-    )  # Adjusted margin and height
-    st.plotly_chart(fig_drawdown, use_container_width=True)  # Use container width
+    ),
+    row=1,
+    col=2,
+)
+fig_hist_risk.update_xaxes(title_text="Date")
+fig_hist_risk.update_yaxes(title_text="Amount (USD)", row=1, col=1)
+fig_hist_risk.update_yaxes(title_text="Drawdown (%)", tickformat=".1%", row=1, col=2)
+fig_hist_risk.update_layout(
+    legend=dict(yanchor="top", y=0.99, xanchor="left", x=0.01),
+    margin=dict(l=10, r=10, t=50, b=10),
+    height=350,
+)  # Extra top margin for subplot titles
+st.plotly_chart(fig_hist_risk, use_container_width=True)  # Use container width
 
 
 st.markdown("---")  # Divider
@@ -244,115 +410,41 @@ st.header("Stress Tests & Scenario Analysis")
 if run_button:
     current_custom_shocks = (custom_spx_shock, custom_rates_shock, custom_oil_shock)
     # Determine scenario parameters
+    shocks = SHOCK_BY_NAME.get(scenario_name) or (
+        (custom_spx_shock or 0.0) / 100.0,
+        custom_rates_shock or 0.0,
+        (custom_oil_shock or 0.0) / 100.0,
+    )
     if scenario_name == "Custom":
-        shocks = {
-            "spx_shock": (custom_spx_shock or 0.0) / 100.0,
-            "rates_shock_bps": custom_rates_shock or 0.0,
-            "oil_shock": (custom_oil_shock or 0.0) / 100.0,
-        }
         current_scenario_display_name = f"Custom ({custom_spx_shock}%, {custom_rates_shock}bps, {custom_oil_shock}%)"
-
-    elif scenario_name in PREDEFINED_SCENARIOS:
-        shocks = PREDEFINED_SCENARIOS[scenario_name]
-        current_scenario_display_name = scenario_name
     else:
-        shocks = {"spx_shock": 0.0, "rates_shock_bps": 0.0, "oil_shock": 0.0}
-        current_scenario_display_name = "None (Baseline)"
+        current_scenario_display_name = scenario_name
 
-    # Get current positions and run simulation
-    df_positions = generate_dummy_positions(
-        selected_portfolio
-    )  # Regenerate positions for the current portfolio
+    # Run simulation (cached per portfolio and shock combination)
     with st.spinner(
         f"Running scenario '{current_scenario_display_name}' for {selected_portfolio}..."
     ):
-        df_results = simulate_scenario_pnl(df_positions, **shocks)
-
-        # --- Create P&L Histogram ---
-        total_pnl = df_results["ScenarioPnL"].sum()
-        fig_hist = px.histogram(
-            df_results,
-            x="ScenarioPnL",
-            nbins=30,
-            title=f"P&L Distribution",
-            labels={"ScenarioPnL": "Position P&L (USD)"},
-        )
-        fig_hist.update_layout(
-            yaxis_title="Number of Positions",
-            margin=dict(l=10, r=10, t=50, b=10),
-            height=400,  # Add title margin
-            title_font_size=16,
-            title_x=0.5,  # Center title
-        )
-
-        # --- Create Impact Scatter Plot ---
-        fig_scatter = px.scatter(
-            df_results,
-            x="MarketValueUSD",
-            y="ScenarioPnL",
-            color="AssetClass",
-            hover_name="Ticker",
-            hover_data=["MarketValueUSD", "ScenarioPnL"],  # Add hover data explicitly
-            size="MarketValueUSD",
-            size_max=15,
-            title=f"Impact: P&L vs Market Value",
-            labels={
-                "MarketValueUSD": "Market Value (USD)",
-                "ScenarioPnL": "Scenario P&L (USD)",
-            },
-        )
-        fig_scatter.update_layout(
-            xaxis_title="Market Value (USD)",
-            yaxis_title="Scenario P&L (USD)",
-            margin=dict(l=10, r=10, t=50, b=10),
-            height=400,  # Add title margin
-            title_font_size=16,
-            title_x=0.5,  # Center title
+        scenario_output = compute_scenario(
+            selected_portfolio, *shocks, positions_df=df_positions
         )
-        fig_scatter.add_hline(y=0, line_dash="dash", line_color="grey")
 
-        # --- Create Summary Table ---
-        summary = (
-            df_results.groupby("AssetClass")["ScenarioPnL"]
-            .agg(["sum", "mean", "count"])
-            .reset_index()
-        )
-        summary.rename(
-            columns={"sum": "Total PnL", "mean": "Avg PnL", "count": "N Positions"},
-            inplace=True,
-        )
-
-        total_row = pd.DataFrame(
-            {
-                "AssetClass": ["**TOTAL**"],  # Bold Total
-                "Total PnL": [summary["Total PnL"].sum()],
-                "Avg PnL": [np.nan],  # No average of averages
-                "N Positions": [summary["N Positions"].sum()],
-            }
-        )
-        summary_df = pd.concat([summary, total_row], ignore_index=True)
-
-        # Store results in session state
-        st.session_state.scenario_results = {
+        # Store the whole run in one session state write
+        st.session_state["last_run"] = {
+            "results": scenario_output,
             "portfolio": selected_portfolio,
             "scenario_name": current_scenario_display_name,  # Use descriptive name
-            "fig_hist": fig_hist,
-            "fig_scatter": fig_scatter,
-            "summary_df": summary_df,
-            "total_pnl": total_pnl,
+            "custom_shocks": (
+                current_custom_shocks if scenario_name == "Custom" else None
+            ),
         }
-        st.session_state.last_run_portfolio = selected_portfolio
-        st.session_state.last_run_scenario_name = current_scenario_display_name
-        st.session_state.last_custom_shocks = (
-            current_custom_shocks if scenario_name == "Custom" else None
-        )
 
 
 # Display scenario results stored in session state
-if st.session_state.scenario_results:
-    results = st.session_state.scenario_results
+last_run = st.session_state["last_run"]
+if last_run:
+    results = last_run["results"]
     st.subheader(
-        f"Results for: {results['portfolio']} - Scenario: {results['scenario_name']}"
+        f"Results for: {last_run['portfolio']} - Scenario: {last_run['scenario_name']}"
     )
     st.metric("Total Scenario P&L", f"${results['total_pnl']:,.0f}")
 
@@ -380,10 +472,13 @@ if st.session_state.scenario_results:
 
         # Optional: Display the positions data used for the run
         # st.subheader("Positions Data Used in Calculation")
-        # st.dataframe(generate_dummy_positions(results['portfolio']).style.format({
+        # st.dataframe(load_portfolio(last_run['portfolio'])[0].style.format({
         #     'MarketValueUSD':'${:,.2f}',
+        #     'Beta_SPX':'{:.3f}',
+        #     'Duration':'{:.3f}',
+        #     'Delta_Oil':'{:.3f}',
         #     'ScenarioPnL':'${:,.2f}', # If Pnl was added back to original df
-        # }, precision=3))
+        # }))
 
 
 else: